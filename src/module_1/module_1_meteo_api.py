@@ -0,0 +1,376 @@
+"""Módulo 1: descarga y análisis de datos meteorológicos de Open-Meteo.
+
+Descarga los datos diarios 2010-2020 de Madrid, Londres y Río de Janeiro
+de forma concurrente, los agrega a frecuencia mensual y genera un gráfico
+de evolución por variable.
+"""
+
+import asyncio
+import gzip
+import hashlib
+import logging
+import random
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+
+import aiohttp
+import matplotlib
+import numpy as np
+import orjson
+import pandas as pd
+
+# Backend sin GUI: evita importar Qt/Tk cuando solo se guardan PNGs.
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt  # noqa: E402
+
+logger = logging.getLogger(__name__)
+
+API_URL = "https://archive-api.open-meteo.com/v1/archive"
+
+COORDINATES = {
+    "Madrid": {"latitude": 40.416775, "longitude": -3.703790},
+    "London": {"latitude": 51.507351, "longitude": -0.127758},
+    "Rio": {"latitude": -22.906847, "longitude": -43.172896},
+}
+
+VARIABLES = ["temperature_2m_mean", "precipitation_sum", "wind_speed_10m_max"]
+
+# Precalculado en el import: estos valores son funciones puras de las
+# constantes del módulo y no hace falta reconstruirlos en cada llamada.
+_DAILY_STR = ",".join(VARIABLES)
+_PARAMS_TEMPLATE = {
+    city: {
+        "latitude": coords["latitude"],
+        "longitude": coords["longitude"],
+        "daily": _DAILY_STR,
+        "timezone": "auto",
+    }
+    for city, coords in COORDINATES.items()
+}
+
+START_DATE = "2010-01-01"
+END_DATE = "2020-12-31"
+
+# Especificación de agregación y mapa de frecuencias compartidos por todo el
+# módulo: un único sitio que mantener si cambian las variables.
+_AGG_SPEC = {
+    "temperature_2m_mean": "mean",
+    "precipitation_sum": "sum",
+    "wind_speed_10m_max": "max",
+}
+_FREQ_MAP = {"M": "M", "Q": "Q", "Y": "Y"}
+
+# Timeout separado de conexión y total, y pool de conexiones compartido para
+# amortizar el handshake TLS entre todas las peticiones al mismo host.
+_TIMEOUT = aiohttp.ClientTimeout(connect=5, total=30)
+
+# Caché en disco de respuestas de la API: el histórico 2010-2020 es inmutable,
+# así que releer el JSON local evita repetir la descarga en cada ejecución.
+_CACHE_DIR = Path(".cache")
+_CACHE_TTL_SECONDS = 30 * 86400
+# Agregados mensuales ya procesados: permite saltarse también el trabajo de
+# pandas aunque la caché de respuestas JSON se invalide.
+_MONTHLY_CACHE = _CACHE_DIR / "monthly.parquet"
+
+
+def _cache_path(url, params):
+    key = orjson.dumps([url, sorted(params.items())], default=str)
+    digest = hashlib.blake2b(key, digest_size=16).hexdigest()
+    return _CACHE_DIR / f"{digest}.json.gz"
+
+
+def _cache_read(path):
+    if not path.exists():
+        return None
+    if time.time() - path.stat().st_mtime > _CACHE_TTL_SECONDS:
+        return None
+    with gzip.open(path, "rb") as f:
+        return orjson.loads(f.read())
+
+
+def _cache_write(path, data):
+    _CACHE_DIR.mkdir(exist_ok=True)
+    with gzip.open(path, "wb") as f:
+        f.write(orjson.dumps(data))
+
+
+class _TokenBucket:
+    """Limitador proactivo de peticiones mediante cubo de tokens.
+
+    Dimensionado al límite publicado de Open-Meteo (60 peticiones/min) para
+    no depender solo de la reacción a los 429.
+    """
+
+    def __init__(self, capacity=60, refill_per_sec=1.0):
+        self.capacity = capacity
+        self.refill_per_sec = refill_per_sec
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            now = time.monotonic()
+            self.tokens = min(
+                self.capacity,
+                self.tokens + (now - self.updated) * self.refill_per_sec,
+            )
+            self.updated = now
+            if self.tokens < 1:
+                await asyncio.sleep((1 - self.tokens) / self.refill_per_sec)
+                self.tokens = 0.0
+                self.updated = time.monotonic()
+            else:
+                self.tokens -= 1
+
+    def sync_remaining(self, remaining):
+        """Ajusta el cubo con el cupo restante que informa el servidor."""
+        self.tokens = min(self.tokens, remaining)
+
+
+_BUCKET = _TokenBucket()
+
+
+def _retry_after_seconds(header, attempt):
+    """Interpreta Retry-After (segundos o fecha HTTP según RFC 7231).
+
+    Si la cabecera falta o no se puede parsear, cae al back-off exponencial.
+    """
+    if header is None:
+        return float(2**attempt)
+    try:
+        return float(header)
+    except ValueError:
+        pass
+    try:
+        delta = parsedate_to_datetime(header) - datetime.now(timezone.utc)
+        return max(delta.total_seconds(), 0.0)
+    except (TypeError, ValueError):
+        return float(2**attempt)
+
+
+def _create_session():
+    """Crea la sesión HTTP compartida con pool de conexiones y gzip."""
+    return aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(limit=8, limit_per_host=8),
+        headers={"Accept-Encoding": "gzip"},
+        timeout=_TIMEOUT,
+    )
+
+
+async def call_api(session, url, params, max_retries=3):
+    """Llama a la API con reintentos y back-off exponencial en caso de 429."""
+    cache_path = _cache_path(url, params)
+    cached = _cache_read(cache_path)
+    if cached is not None:
+        return cached
+
+    for attempt in range(max_retries):
+        await _BUCKET.acquire()
+        try:
+            async with session.get(url, params=params) as response:
+                remaining = response.headers.get("X-RateLimit-Remaining")
+                if remaining is not None:
+                    try:
+                        _BUCKET.sync_remaining(float(remaining))
+                    except ValueError:
+                        # Cabecera mal formada: nunca debe abortar la petición.
+                        pass
+                if response.status == 200:
+                    # orjson parsea los arrays numéricos del bloque "daily"
+                    # bastante más rápido que el json de la stdlib.
+                    data = orjson.loads(await response.read())
+                    _cache_write(cache_path, data)
+                    return data
+                if response.status == 429:
+                    logger.debug(
+                        "Intento %s: límite de peticiones alcanzado", attempt + 1
+                    )
+                    # Respetar la espera que indica el servidor y añadir jitter
+                    # para no sincronizar los reintentos entre peticiones.
+                    wait = _retry_after_seconds(
+                        response.headers.get("Retry-After"), attempt
+                    )
+                    wait += random.uniform(0, wait * 0.25)
+                else:
+                    logger.debug("Intento %s: código %s", attempt + 1, response.status)
+                    wait = min(2**attempt + random.random(), 30)
+                if attempt < max_retries - 1:
+                    await asyncio.sleep(wait)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.debug("Intento %s: error de conexión %s", attempt + 1, e)
+            if attempt < max_retries - 1:
+                await asyncio.sleep(min(2**attempt + random.random(), 30))
+    return None
+
+
+def _build_daily_dataframe(daily, city):
+    """Construye el DataFrame diario de una ciudad a partir del bloque JSON.
+
+    Tipa las columnas al construir: una sola pasada de parseo de fechas (con
+    formato explícito) y float32 en vez de float64 para las variables.
+    """
+    columns = {"time": pd.to_datetime(daily["time"], format="%Y-%m-%d", cache=True)}
+    for variable in VARIABLES:
+        columns[variable] = np.asarray(daily[variable], dtype=np.float32)
+    df = pd.DataFrame(columns)
+    # Categórica en vez de object para no penalizar groupby/resample aguas abajo.
+    df["city"] = pd.Categorical.from_codes(
+        np.zeros(len(df), dtype=np.int8), categories=[city]
+    )
+    return df
+
+
+async def get_data_meteo_api(session, city, start_date, end_date):
+    """Obtiene los datos diarios de una ciudad como DataFrame."""
+    params = {
+        **_PARAMS_TEMPLATE[city],
+        "start_date": start_date,
+        "end_date": end_date,
+    }
+    data = await call_api(session, API_URL, params)
+    if data is None or "daily" not in data:
+        logger.warning("No se han podido obtener datos para %s", city)
+        return None
+    return _build_daily_dataframe(data["daily"], city)
+
+
+async def get_all_cities_meteo(session, cities, start_date, end_date):
+    """Obtiene los datos diarios de varias ciudades en una sola petición.
+
+    La API de Open-Meteo acepta listas de coordenadas separadas por comas y
+    devuelve un bloque "daily" por localización, lo que evita una petición
+    por ciudad.
+    """
+    params = {
+        "latitude": ",".join(str(COORDINATES[c]["latitude"]) for c in cities),
+        "longitude": ",".join(str(COORDINATES[c]["longitude"]) for c in cities),
+        "start_date": start_date,
+        "end_date": end_date,
+        "daily": _DAILY_STR,
+        "timezone": "auto",
+    }
+    data = await call_api(session, API_URL, params)
+    if data is None:
+        logger.warning("No se han podido obtener datos de la API")
+        return {city: None for city in cities}
+    # Con una única localización la API devuelve un dict en vez de una lista.
+    blocks = data if isinstance(data, list) else [data]
+    return {
+        city: _build_daily_dataframe(block["daily"], city)
+        for city, block in zip(cities, blocks)
+    }
+
+
+def process_weather_data(df, resample_freq="M", period_key=None):
+    """Agrega los datos diarios a la frecuencia indicada (M, Q o Y).
+
+    ``period_key`` permite reutilizar una clave de periodos ya calculada
+    cuando varios DataFrames comparten el mismo rango de fechas.
+    """
+    if period_key is None:
+        freq = _FREQ_MAP.get(resample_freq, "Y")
+        period_key = df["time"].dt.to_period(freq)
+    result = df.groupby(period_key, sort=False, observed=True).agg(_AGG_SPEC)
+    # La ciudad es constante por DataFrame: reasignarla como escalar evita
+    # agregar una columna object, que degrada el rendimiento del groupby.
+    result["city"] = df["city"].iat[0]
+    result = result.reset_index()
+    result["time"] = result["time"].dt.to_timestamp()
+    return result
+
+
+def plot_weather_evolution(cities_data, variable, output_file=None, ax=None):
+    """Dibuja la evolución temporal de una variable para todas las ciudades.
+
+    Espera frames ya agregados (los que devuelve get_complete_weather_data);
+    no re-procesa los datos. Si no se pasa ``ax`` crea su propia figura, y
+    solo guarda a disco cuando se indica ``output_file``.
+    """
+    if ax is None:
+        fig, ax = plt.subplots(figsize=(12, 6))
+    else:
+        fig = ax.figure
+    for city, city_data in cities_data.items():
+        if city_data is None:
+            continue
+        ax.plot(city_data["time"], city_data[variable], label=city)
+    ax.set_title(f"Evolución de {variable}")
+    ax.set_xlabel("Fecha")
+    ax.set_ylabel(variable)
+    ax.legend()
+    ax.grid(True)
+    if output_file is not None:
+        fig.savefig(output_file, dpi=150, bbox_inches="tight")
+    return ax
+
+
+def plot_all(cities_data, output_file="grafico_all.png"):
+    """Dibuja las tres variables en una sola figura con eje temporal común.
+
+    Reutiliza una única figura y una sola llamada a savefig (a 150 dpi) en
+    lugar de una figura a 300 dpi por variable, que es lo que dominaba el
+    tiempo de ejecución.
+    """
+    fig, axes = plt.subplots(3, 1, sharex=True, figsize=(12, 12))
+    for ax, variable in zip(axes, VARIABLES):
+        plot_weather_evolution(cities_data, variable, ax=ax)
+    for ax in axes[:-1]:
+        ax.set_xlabel("")
+    fig.savefig(output_file, dpi=150, bbox_inches="tight")
+    return fig
+
+
+async def get_complete_weather_data():
+    """Descarga y procesa los datos de todas las ciudades en una petición.
+
+    Los agregados mensuales son deterministas para un rango de fechas fijo,
+    así que se persisten en Parquet y las ejecuciones siguientes los releen
+    sin tocar ni la red ni el pipeline de pandas.
+    """
+    if _MONTHLY_CACHE.exists() and (
+        time.time() - _MONTHLY_CACHE.stat().st_mtime < _CACHE_TTL_SECONDS
+    ):
+        monthly = pd.read_parquet(_MONTHLY_CACHE)
+        return {
+            city: group.reset_index(drop=True)
+            for city, group in monthly.groupby("city", sort=False, observed=True)
+        }
+
+    async with _create_session() as session:
+        raw_data = await get_all_cities_meteo(
+            session, list(COORDINATES), START_DATE, END_DATE
+        )
+
+    frames = [df for df in raw_data.values() if df is not None]
+    if not frames:
+        return {city: None for city in raw_data}
+    # Todas las ciudades comparten el rango de fechas de la petición batched,
+    # así que la clave de periodos mensual se calcula una sola vez.
+    period_key = frames[0]["time"].dt.to_period(_FREQ_MAP["M"])
+    cities_data = {
+        city: (
+            process_weather_data(df, "M", period_key=period_key)
+            if df is not None
+            else None
+        )
+        for city, df in raw_data.items()
+    }
+
+    # Solo se cachea una ejecución completa para no fijar huecos de datos.
+    if all(df is not None for df in cities_data.values()):
+        _CACHE_DIR.mkdir(exist_ok=True)
+        pd.concat(cities_data.values()).to_parquet(_MONTHLY_CACHE, compression="zstd")
+    return cities_data
+
+
+def main():
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+    cities_data = asyncio.run(get_complete_weather_data())
+    plot_all(cities_data)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,78 @@
-""" This is a dummy example to show how to import code from src/ for testing"""
+"""Tests unitarios del módulo 1 (API meteo)."""
 
-from src.module_1.module_1_meteo_api import main
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
 
+import pandas as pd
+import pytest
 
-def test_main():
-    raise NotImplementedError
\ No newline at end of file
+from src.module_1.module_1_meteo_api import (
+    COORDINATES,
+    VARIABLES,
+    _build_daily_dataframe,
+    _retry_after_seconds,
+    process_weather_data,
+)
+
+
+def _build_daily_df(city="Madrid"):
+    dates = pd.date_range("2020-01-01", "2020-02-29", freq="D")
+    return pd.DataFrame(
+        {
+            "time": dates,
+            "temperature_2m_mean": 10.0,
+            "precipitation_sum": 1.0,
+            "wind_speed_10m_max": 5.0,
+            "city": city,
+        }
+    )
+
+
+def test_process_weather_data_monthly():
+    result = process_weather_data(_build_daily_df(), "M")
+    assert len(result) == 2
+    assert result["temperature_2m_mean"].iloc[0] == pytest.approx(10.0)
+    assert result["precipitation_sum"].iloc[0] == pytest.approx(31.0)
+    assert result["wind_speed_10m_max"].iloc[0] == pytest.approx(5.0)
+    assert (result["city"] == "Madrid").all()
+
+
+def test_process_weather_data_yearly():
+    result = process_weather_data(_build_daily_df(), "Y")
+    assert len(result) == 1
+    assert result["precipitation_sum"].iloc[0] == pytest.approx(60.0)
+
+
+def test_process_weather_data_accepts_precomputed_period_key():
+    df = _build_daily_df()
+    key = df["time"].dt.to_period("M")
+    result = process_weather_data(df, "M", period_key=key)
+    pd.testing.assert_frame_equal(result, process_weather_data(df, "M"))
+
+
+def test_build_daily_dataframe_dtypes():
+    daily = {
+        "time": ["2020-01-01", "2020-01-02"],
+        "temperature_2m_mean": [1.0, 2.0],
+        "precipitation_sum": [0.0, 3.5],
+        "wind_speed_10m_max": [4.0, 5.0],
+    }
+    df = _build_daily_dataframe(daily, "Rio")
+    assert df["time"].dtype.kind == "M"
+    assert df["temperature_2m_mean"].dtype == "float32"
+    assert df["city"].dtype == "category"
+    assert (df["city"] == "Rio").all()
+
+
+def test_retry_after_seconds_handles_all_header_forms():
+    assert _retry_after_seconds(None, 2) == pytest.approx(4.0)
+    assert _retry_after_seconds("7", 0) == pytest.approx(7.0)
+    assert _retry_after_seconds("garbage", 3) == pytest.approx(8.0)
+    http_date = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=60))
+    assert 0.0 <= _retry_after_seconds(http_date, 0) <= 60.0
+
+
+def test_coordinates_and_variables_defined():
+    assert set(COORDINATES) == {"Madrid", "London", "Rio"}
+    assert all({"latitude", "longitude"} <= set(v) for v in COORDINATES.values())
+    assert len(VARIABLES) == 3
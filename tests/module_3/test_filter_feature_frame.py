@@ -0,0 +1,35 @@
+"""Tests unitarios del módulo 3 (filtrado del feature frame)."""
+
+import pandas as pd
+
+from src.module_3.filter_feature_frame import filter_feature_frame
+
+
+def test_filter_feature_frame_keeps_users_with_enough_rows(tmp_path):
+    csv_path = tmp_path / "feature_frame.csv"
+    pd.DataFrame(
+        {
+            "user_id": ["a"] * 5 + ["b"] * 2 + ["c"] * 6,
+            "outcome": [0] * 13,
+        }
+    ).to_csv(csv_path, index=False)
+
+    filtered_df = filter_feature_frame(csv_path, min_rows=5)
+
+    assert set(filtered_df["user_id"]) == {"a", "c"}
+    assert len(filtered_df) == 11
+
+
+def test_filter_feature_frame_ignores_missing_user_ids(tmp_path):
+    csv_path = tmp_path / "feature_frame.csv"
+    pd.DataFrame(
+        {
+            "user_id": ["a"] * 5 + [None, None] + ["b"] * 2,
+            "outcome": [0] * 9,
+        }
+    ).to_csv(csv_path, index=False)
+
+    filtered_df = filter_feature_frame(csv_path, min_rows=5)
+
+    assert set(filtered_df["user_id"]) == {"a"}
+    assert len(filtered_df) == 5